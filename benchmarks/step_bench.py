@@ -0,0 +1,52 @@
+#!/usr/bin/python
+
+# step_bench.py
+#
+# Per-call cost of the per-sample hot paths: PID.gen_out() (with and without LoopMetrics
+#  attached) and PeakCounter.add_value().  Run from the repository root:
+#
+#    python benchmarks/step_bench.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pid_controller import LoopMetrics, PID, PeakCounter
+
+NUMBER = 200000
+REPEAT = 5
+
+def per_call_us(func, number=NUMBER):
+    """ Best-of-REPEAT time per call, in microseconds. """
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number * 1e6
+
+def make_pid(metrics=False):
+    p = PID.PID()
+    p.Kp, p.Ki, p.Kd = 1.2, 0.5, 0.1
+    p.setpoint = 50.0
+    p.out_min, p.out_max = 0.0, 100.0
+    if metrics:
+        LoopMetrics.LoopMetrics().attach(p)
+    p.gen_out(40.0)
+    return p
+
+def main():
+    p = make_pid()
+    print("PID.gen_out                 %.3f us" % per_call_us(lambda: p.gen_out(49.0)))
+    p = make_pid()
+    print("PID.gen_out (clamped)       %.3f us" % per_call_us(lambda: p.gen_out(-1000.0)))
+    p = make_pid(metrics=True)
+    print("PID.gen_out + LoopMetrics   %.3f us" % per_call_us(lambda: p.gen_out(49.0)))
+
+    # PeakCounter keeps every value, so use a fresh one per batch
+    vals = [(i % 7) - 3 for i in range(1000)]
+    def add_batch():
+        pc = PeakCounter.PeakCounter(len(vals))
+        for val in vals:
+            pc.add_value(val)
+    print("PeakCounter.add_value       %.3f us" % (per_call_us(add_batch, number=200) / len(vals)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#-------------------------------------------------------------------------------
+# CycleStats.py
+# Rolling per-cycle statistics of an oscillating signal, for autotuning
+#-------------------------------------------------------------------------------
+#
+# Copyright 2026 The pid_controller contributors
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+import time
+from collections import deque
+
+class CycleStats(object):
+    """ CycleStats keeps rolling statistics about an oscillating signal, such as the process
+        variable during a relay autotune.
+
+        A cycle runs from one upward crossing of setpoint + noise_band to the next (the signal
+        has to drop below setpoint - noise_band in between, so chatter inside the band is
+        ignored).  For each completed cycle the maximum, its time, and the minimum are recorded;
+        amplitude, period and extremum statistics are kept over the last `window` cycles.
+
+        Each add_value() does a constant amount of work, and no sample history is kept."""
+
+    def __init__(self, setpoint, noise_band=0, window=3):
+        # config
+        self.setpoint = setpoint
+        self.noise_band = noise_band
+        if int(window) < 2:
+            raise ValueError("window must be at least 2 cycles")
+        self._window = int(window)
+
+        # whole-run extremes
+        self.abs_max = None
+        self.abs_min = None
+
+        # completed cycles, most recent last
+        self.cycles = 0
+        self._maxima = deque(maxlen=self._window)      # (value, time) of each cycle's max
+        self._minima = deque(maxlen=self._window)
+        self._periods = deque(maxlen=self._window)
+
+        # cached per-cycle results
+        self._window_max = None
+        self._window_min = None
+        self._amplitude = None
+        self._period = None
+        self._peak_spread = None
+
+        # state
+        self._high = None          # None until the signal first leaves the band
+        self._in_cycle = False     # False until the first upward crossing
+        self._cyc_max = None
+        self._cyc_max_time = None
+        self._cyc_min = None
+        self._just_completed = False
+
+    @property
+    def window(self):
+        return self._window
+
+    @property
+    def full(self):
+        """ True once `window` cycles have been completed. """
+        return len(self._maxima) == self._window
+
+    @property
+    def just_completed(self):
+        """ True iff the last added value completed a cycle. """
+        return self._just_completed
+
+    @property
+    def window_max(self):
+        """ Highest value seen in the last `window` cycles. """
+        return self._window_max
+
+    @property
+    def window_min(self):
+        """ Lowest value seen in the last `window` cycles. """
+        return self._window_min
+
+    @property
+    def amplitude(self):
+        """ Mean peak-to-peak amplitude of the last `window` cycles. """
+        return self._amplitude
+
+    @property
+    def period(self):
+        """ Mean time between successive cycle maxima, over the last `window` cycles. """
+        return self._period
+
+    @property
+    def peak_spread(self):
+        """ Mean absolute difference between successive cycle maxima in the window. """
+        return self._peak_spread
+
+    def get_last_peaks(self, n):
+        """ Return the maxima of the last n completed cycles (at most `window`), earliest first. """
+        peaks = [val for val, _ in self._maxima]
+        return peaks[max(len(peaks) - n, 0):]
+
+    def add_value(self, val, now=None):
+        if now is None:
+            now = time.time()
+        self._just_completed = False
+
+        if self.abs_max is None or val > self.abs_max:
+            self.abs_max = val
+        if self.abs_min is None or val < self.abs_min:
+            self.abs_min = val
+
+        if val > self.setpoint + self.noise_band:
+            if self._high is not True:
+                if self._in_cycle:
+                    self._complete_cycle()
+                self._cyc_max = self._cyc_min = None
+                self._in_cycle = True
+                self._high = True
+        elif val < self.setpoint - self.noise_band:
+            self._high = False
+
+        if not self._in_cycle:
+            return
+        if self._cyc_max is None or val > self._cyc_max:
+            self._cyc_max = val
+            self._cyc_max_time = now
+        if self._cyc_min is None or val < self._cyc_min:
+            self._cyc_min = val
+
+    def _complete_cycle(self):
+        """ Record the cycle that just ended and refresh the windowed statistics. """
+        if self._maxima:
+            self._periods.append(self._cyc_max_time - self._maxima[-1][1])
+        self._maxima.append((self._cyc_max, self._cyc_max_time))
+        self._minima.append(self._cyc_min)
+        self.cycles += 1
+        self._just_completed = True
+
+        # these only run once per cycle, over at most `window` items
+        maxima = [val for val, _ in self._maxima]
+        self._window_max = max(maxima)
+        self._window_min = min(self._minima)
+        self._amplitude = sum(hi - lo for hi, lo in zip(maxima, self._minima)) / float(len(maxima))
+        if self._periods:
+            self._period = sum(self._periods) / float(len(self._periods))
+        if len(maxima) > 1:
+            self._peak_spread = sum(abs(b - a) for a, b in zip(maxima, maxima[1:])) / float(len(maxima) - 1)
@@ -0,0 +1,210 @@
+#-------------------------------------------------------------------------------
+# LoopMetrics.py
+# Incremental loop-performance metrics for PID controllers
+#-------------------------------------------------------------------------------
+#
+# Copyright 2026 The pid_controller contributors
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+# The metrics are updated once per PID.gen_out() call, with constant work per
+#  update, so no raw PV/output history needs to be kept or exported.
+
+
+from pid_controller.PeakCounter import PeakState
+
+class LoopMetrics(object):
+    """ Running performance metrics for a single PID loop.
+
+        Once attached to a PID (see attach()), each call to gen_out() updates:
+          iae, ise, itae   - integrated absolute / squared / time-weighted absolute error
+          peaks            - number of half-cycles of the error signal: swings from above
+                             +noise_band to below -noise_band, or back
+          oscillation_index - half-cycles per second of (automatic mode) operation
+          saturation_fraction - fraction of time the output was clamped to out_min/out_max
+          valve_travel     - total absolute change in output
+          valve_reversals  - number of times the output changed direction
+    """
+
+    # pylint: disable=E0202
+    #    (pylint 0.25.1 can't handle property assignment from init - see http://www.logilab.org/ticket/89786)
+
+    def __init__(self, noise_band=0.5):
+        # half-cycles are counted with the same band-crossing rule as CycleStats, so sensor
+        #  noise smaller than noise_band (in PV units) around the setpoint is not an oscillation
+        self.noise_band = noise_band
+        self.reset()
+
+    @property
+    def noise_band(self):
+        return self._noise_band
+
+    @noise_band.setter
+    def noise_band(self, band):
+        """ Ignore error swings that stay within +/- this much of zero. """
+        if band < 0:
+            raise ValueError("noise_band can't be negative")
+        self._noise_band = band
+
+    def reset(self):
+        """ Zero all accumulated metrics. """
+        self.samples = 0
+        self.elapsed = 0.0
+        self.iae = 0.0
+        self.ise = 0.0
+        self.itae = 0.0
+        self.saturated_time = 0.0
+        self.valve_travel = 0.0
+        self.valve_reversals = 0
+        self.peaks = 0
+
+        self._state = PeakState.NONE
+        self._last_out = None
+        self._last_move = 0
+
+    def attach(self, pid):
+        """ Start collecting metrics from the given PID.  Returns self.
+
+            Raises ValueError if the PID already reports to a different LoopMetrics.
+        """
+        if pid.metrics is not None and pid.metrics is not self:
+            raise ValueError("PID is already attached to another LoopMetrics")
+        pid.metrics = self
+        return self
+
+    def detach(self, pid):
+        """ Stop collecting metrics from the given PID (if it is attached to this one). """
+        if pid.metrics is self:
+            pid.metrics = None
+
+    @property
+    def oscillation_index(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.peaks / self.elapsed
+
+    @property
+    def saturation_fraction(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.saturated_time / self.elapsed
+
+    def update(self, error, output, dt, saturated=False):
+        """ Fold one controller step into the running metrics.
+
+            Called from PID.gen_out(); can also be fed directly (e.g. from logged data).
+        """
+        self.samples += 1
+        self.elapsed += dt
+
+        abs_err = abs(error)
+        self.iae += abs_err * dt
+        self.ise += error * error * dt
+        self.itae += self.elapsed * abs_err * dt
+        if saturated:
+            self.saturated_time += dt
+
+        # valve travel & direction reversals
+        if self._last_out is not None:
+            move = output - self._last_out
+            self.valve_travel += abs(move)
+            if move != 0:
+                if self._last_move != 0 and (move > 0) != (self._last_move > 0):
+                    self.valve_reversals += 1
+                self._last_move = move
+        self._last_out = output
+
+        # half-cycle detection on the error signal, with hysteresis of +/- noise_band
+        if error > self._noise_band:
+            if self._state == PeakState.LOW:
+                self.peaks += 1
+            self._state = PeakState.HIGH
+        elif error < -self._noise_band:
+            if self._state == PeakState.HIGH:
+                self.peaks += 1
+            self._state = PeakState.LOW
+
+    def snapshot(self):
+        """ Return the current metrics as a plain dict. """
+        return {
+            'samples': self.samples,
+            'elapsed': self.elapsed,
+            'iae': self.iae,
+            'ise': self.ise,
+            'itae': self.itae,
+            'peaks': self.peaks,
+            'oscillation_index': self.oscillation_index,
+            'saturation_fraction': self.saturation_fraction,
+            'valve_travel': self.valve_travel,
+            'valve_reversals': self.valve_reversals,
+        }
+
+
+class MetricsRegistry(object):
+    """ Collection of LoopMetrics, keyed by loop ID, for monitoring many controllers at once. """
+
+    def __init__(self, noise_band=0.5):
+        self.noise_band = noise_band        # default for loops registered without their own
+        self._loops = {}
+        self._pids = {}             # loop_id -> attached PID, so unregister() can detach it
+
+    def __len__(self):
+        return len(self._loops)
+
+    def __contains__(self, loop_id):
+        return loop_id in self._loops
+
+    def __getitem__(self, loop_id):
+        return self._loops[loop_id]
+
+    def register(self, loop_id, pid=None, noise_band=None):
+        """ Create (or return the existing) LoopMetrics for loop_id, attaching it to pid if given.
+
+            noise_band (default: the registry's) only applies when the LoopMetrics is created.
+
+            Raises ValueError if pid is already attached to a different loop, or if loop_id
+            already has a different PID attached.
+        """
+        if pid is not None and self._pids.get(loop_id, pid) is not pid:
+            raise ValueError("loop %r already has a PID attached" % (loop_id,))
+        metrics = self._loops.get(loop_id)
+        if metrics is None:
+            if pid is not None and pid.metrics is not None:
+                raise ValueError("PID is already attached to another LoopMetrics")
+            if noise_band is None:
+                noise_band = self.noise_band
+            metrics = self._loops[loop_id] = LoopMetrics(noise_band)
+        if pid is not None:
+            metrics.attach(pid)
+            self._pids[loop_id] = pid
+        return metrics
+
+    def unregister(self, loop_id):
+        """ Forget loop_id, detaching its PID (if any) so it stops updating the metrics. """
+        metrics = self._loops.pop(loop_id)
+        pid = self._pids.pop(loop_id, None)
+        if pid is not None:
+            metrics.detach(pid)
+
+    def reset(self):
+        for metrics in self._loops.values():
+            metrics.reset()
+
+    def snapshot(self):
+        """ Return {loop_id: metrics dict} for every registered loop. """
+        return dict((loop_id, metrics.snapshot()) for loop_id, metrics in self._loops.items())
+
+    def worst(self, n=10, key='iae'):
+        """ Return the n (loop_id, metrics dict) pairs with the highest value for key. """
+        snap = self.snapshot()
+        return sorted(snap.items(), key=lambda item: item[1][key], reverse=True)[:n]
@@ -57,6 +57,9 @@ class PID(object):
         self._manual_mode = False
         self._manual_override_output = None
 
+        # optional LoopMetrics (see LoopMetrics.attach()), updated on every gen_out()
+        self.metrics = None
+
         self.initialize()
 
     @property 
@@ -102,9 +105,9 @@ class PID(object):
                 gen_out() has not yet been called, this will return the manually set level
         """
         if manout is not None:
-            if (manout < self.out_min):
+            if self.out_min is not None and (manout < self.out_min):
                 manout = self.out_min
-            elif (manout > self.out_max):
+            elif self.out_max is not None and (manout > self.out_max):
                 manout = self.out_max
             self.manual_mode = True
             self._manual_override_output = manout
@@ -145,12 +148,6 @@ class PID(object):
 
         ## working error variables
         error = self.setpoint - current_PV
-        self._Ci += self.Ki * (error * dt)      # add current error to accumulated error
-                                                # Ki brought in to the integral term to avoid
-                                                #  I-term bumps when tuning parameters are
-                                                #  changed
-                                                # http://brettbeauregard.com/blog/2011/04/improving-the-beginner%E2%80%99s-pid-tuning-changes/
-
 
         # derivative computation
         #
@@ -162,24 +159,35 @@ class PID(object):
         #
         # see http://brettbeauregard.com/blog/2011/04/improving-the-beginner%E2%80%99s-pid-derivative-kick/
         dPV = current_PV - self._prev_PV          
-        self._Cd = 0                             # avoid div by zero
+
+        Ci = self._Ci + self.Ki * (error * dt)  # add current error to accumulated error
+                                                # Ki brought in to the integral term to avoid
+                                                #  I-term bumps when tuning parameters are
+                                                #  changed
+                                                # http://brettbeauregard.com/blog/2011/04/improving-the-beginner%E2%80%99s-pid-tuning-changes/
+        Cd = 0                                   # avoid div by zero
         if dt > 0:
-            self._Cd = dPV / dt    
+            Cd = dPV / dt    
 
         # compute output
-        outval = (self.Kp * error) + self._Ci - (self.Kd * self._Cd)
+        outval = (self.Kp * error) + Ci - (self.Kd * Cd)
         # constrain Ci to configured limits to avoid 'reset windup' (when the I term 
         #  grows really large as the PV slowly approaches the setpoint)
         #
         # [From comment thread at http://brettbeauregard.com/blog/2011/04/improving-the-beginner%E2%80%99s-pid-reset-windup/]
-        if self.out_max is not None:
-            if (outval > self.out_max):
-                self._Ci -= outval - self.out_max
-                outval = self.out_max
-        if self.out_min is not None:
-            if (outval < self.out_min):
-                self._Ci += self.out_min - outval
-                outval = self.out_min            
+        saturated = False
+        out_max = self.out_max
+        if out_max is not None and outval > out_max:
+            Ci -= outval - out_max
+            outval = out_max
+            saturated = True
+        out_min = self.out_min
+        if out_min is not None and outval < out_min:
+            Ci += out_min - outval
+            outval = out_min
+            saturated = True
+        self._Ci = Ci
+        self._Cd = Cd
         
         self._Cp = error                         # for external view of PID state
         
@@ -188,4 +196,6 @@ class PID(object):
         self._prev_PV = current_PV                             
 
         self._last_out = outval
+        if self.metrics is not None:
+            self.metrics.update(error, outval, dt, saturated)
         return self._last_out
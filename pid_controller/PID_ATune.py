@@ -22,7 +22,8 @@
 
 
 import time
-import PeakCounter
+
+from pid_controller import CycleStats
 
 # TODOs (FIXME)
 # * fix docstring
@@ -30,6 +31,14 @@ import PeakCounter
 class ControlType:
     PI, PID = range(2)
 
+class KuExtent:
+    """ What the oscillation's peak-to-peak range (and so Ku) is measured from:
+          AMPLITUDE - mean peak-to-peak amplitude of each of the last cycle_window cycles
+          WINDOW    - highest max minus lowest min over the last cycle_window cycles
+          RUN       - highest max minus lowest min over the whole tune
+    """
+    AMPLITUDE, WINDOW, RUN = range(3)
+
 class PIDNotStableError(Exception):
     def __init__(self, arg):
         self.msg = arg
@@ -42,6 +51,10 @@ class PID_ATune(object):
         takes:
           measure_func - function that will return a float indicating the current value 
                           of the Process Variable (value influenced by the PID)
+
+        Oscillation statistics for the last Tune() run are in `stats` (a CycleStats).
+        abs_max/abs_min are read-only views of it; the PeakCounter that used to be exposed
+        as `PC` is no longer used or provided.
     """
 
     # pylint: disable=E0202
@@ -64,10 +77,15 @@ class PID_ATune(object):
         self.noise_band = None
         self.lookback_sec = 10
         self.noise_band = 0.5
+        """ Number of recent oscillation cycles that amplitude/period statistics are taken over. """
+        self.cycle_window = 3
+        """ Oscillation range Ku is computed from; see KuExtent.  RUN is the original behavior,
+            but one early outlier skews it permanently. """
+        self.ku_extent = KuExtent.AMPLITUDE
 
-        self._max_peaks = 9
+        self._max_cycles = 9
 
-        self.PC = PeakCounter.PeakCounter(self._max_peaks)
+        self.stats = None
 
         self._last_time = time.time()
 
@@ -81,6 +99,16 @@ class PID_ATune(object):
             raise TypeError("control_type takes a boolean")
         self.__control_type = ct
 
+    @property
+    def ku_extent(self):
+        return self._ku_extent
+
+    @ku_extent.setter
+    def ku_extent(self, extent):
+        if extent not in (KuExtent.AMPLITUDE, KuExtent.WINDOW, KuExtent.RUN):
+            raise ValueError("ku_extent must be one of the KuExtent values")
+        self._ku_extent = extent
+
     @property
     def lookback_sec(self):
         return int(self._num_lookback_samples * self._sample_time)
@@ -102,8 +130,30 @@ class PID_ATune(object):
         # put things back where we found them
         self._change_output(self._output_start)
         
-        self._Ku = 4 * (2 * self.output_step) / ((self.abs_max - self.abs_min) * 3.14159)
-        self._Pu = self.PC.last_peak_delta 
+        self._Ku = 4 * (2 * self.output_step) / (self._extent() * 3.14159)
+        self._Pu = self.stats.period
+
+    def _extent(self):
+        """ Peak-to-peak range of the oscillation that Ku is based on (see ku_extent).
+
+            Falls back to the whole-run range until a cycle has been completed.
+        """
+        if self.stats.cycles:
+            if self._ku_extent == KuExtent.AMPLITUDE:
+                return self.stats.amplitude
+            if self._ku_extent == KuExtent.WINDOW:
+                return self.stats.window_max - self.stats.window_min
+        return self.stats.abs_max - self.stats.abs_min
+
+    @property
+    def abs_max(self):
+        """ Highest PV seen during the last Tune() run. """
+        return self.stats.abs_max if self.stats is not None else None
+
+    @property
+    def abs_min(self):
+        """ Lowest PV seen during the last Tune() run. """
+        return self.stats.abs_min if self.stats is not None else None
     
     def _change_output(self, newout):
         self._output = self._output_func(newout)
@@ -115,11 +165,8 @@ class PID_ATune(object):
             Raises PIDNotStableError if instability is detected.  Returns True if stable.
         """
         accuracy = 0.005 ## allow 0.5% variance to still count as "stable" (IMPROVE: - make configurable?)
-        print "in verify_stability()"
         output = self._change_output(None)
-        print "output is %f " % output
         input = self._measure_func()
-        print "input is %f" % input
         last_check = time.time()
         for delay in (0.01, 0.1, 1.0, 10, 100):  
             now = time.time()
@@ -137,7 +184,6 @@ class PID_ATune(object):
             if (curr_out != output):
                 raise PIDNotStableError("Output level changing.  Expected %d, got %d (after %fs)" % (output, curr_out, delay))
 
-        print "we're stable!"
         return True
     
     def Tune(self):
@@ -149,13 +195,15 @@ class PID_ATune(object):
         self.verify_stability()
         
         last_run = 0
-        self.abs_max = self.abs_min = self.setpoint = self._measure_func()
+        self.setpoint = self._measure_func()
+        self.stats = CycleStats.CycleStats(self.setpoint, self.noise_band, self.cycle_window)
+        self.stats.add_value(self.setpoint)
 
         self._output_start = self._change_output(None)
         self._change_output(self._output + self.output_step)
         
         while (True):
-            if self.PC.num_peaks > self._max_peaks:
+            if self.stats.cycles > self._max_cycles:
                 return self._finish_up()      
 
             # don't run main Tune loop more often than sampleTime, but also account for other interrupts
@@ -169,27 +217,19 @@ class PID_ATune(object):
             # measure
             ref_val = self._measure_func()
             
-            # update max/min
-            if ref_val > self.abs_max:
-                self.abs_max = ref_val
-            elif ref_val < self.abs_min:
-                self.abs_min = ref_val
-
             ## oscillate output based on the current PV's relation to the setpoint
             if ref_val > (self.setpoint + self.noise_band):
                 self._change_output(self._output - self.output_step)
             elif ref_val < (self.setpoint - self.noise_band):
                 self._change_output(self._output + self.output_step)
             
-            # look for peaks
-            self.PC.add_value(ref_val)
+            # update per-cycle max/min, amplitude and period
+            self.stats.add_value(ref_val, now)
 
-            # see if we have enough peaks         
-            if self.PC.just_inflected and (self.PC.num_peaks > 2):
+            # see if we have enough cycles
+            if self.stats.just_completed and self.stats.full:
                 # see if it's possible to autotune based on the last peaks
-                pks = self.PC.get_last_peaks(3)
-                avg_separation = (abs(pks[2] - pks[1]) + abs(pks[1] - pks[0]))/2
-                if avg_separation < 0.05 * (self.abs_max - self.abs_min):
+                if self.stats.peak_spread < 0.05 * self._extent():
                     return self._finish_up()
     
     @property
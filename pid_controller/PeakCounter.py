@@ -1,5 +1,6 @@
 #!/usr/bin/python
 
+import numbers
 import time
 
 class PeakState:
@@ -57,7 +58,6 @@ class PeakCounter(object):
 
     @property
     def num_peaks(self):
-        print self._peaks
         if self._peaks[self._num_peaks] is not None:
             if self._state == PeakState.LOW:
                 ## low points are put in as a holding place (why?  FIXME?)
@@ -79,7 +79,7 @@ class PeakCounter(object):
     
     def add_value(self, val):
         is_max = is_min = False   # FIXME - is this where we want to default
-        if not isinstance(val, (int, long, float, complex)):
+        if not isinstance(val, numbers.Number):
             raise ValueError("PeakCounter can only take numbers")
 
         ## we compute max/min within the most recent _lookback_size data points
@@ -92,17 +92,14 @@ class PeakCounter(object):
         # print "checking min/max of %f against %s" % (val,str(lookbackwindow))
         if len(self._data):
             if val > max(lookbackwindow):
-                print "is max!"
                 is_max = True
             if val < min(lookbackwindow):
-                print "is min!"
                 is_min = True
         else:
             #  this is the first value 
             is_max = True
         
         if is_max:
-            print "%f is a max" % val
             if self._state == PeakState.NONE:
                 self._state = PeakState.HIGH
             elif self._state == PeakState.LOW:
@@ -113,7 +110,6 @@ class PeakCounter(object):
             # print "adding %f to peak spot %d" % (val, self._num_peaks)
             self._peaks[self._num_peaks] = val
         elif is_min:
-            print "%f is a min" % val
             if self._state == PeakState.NONE:
                 self._state = PeakState.LOW
             if self._state == PeakState.HIGH:
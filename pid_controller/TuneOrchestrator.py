@@ -0,0 +1,290 @@
+#-------------------------------------------------------------------------------
+# TuneOrchestrator.py
+# Run many PID autotunes in parallel, with a cache of previous results
+#-------------------------------------------------------------------------------
+#
+# Copyright 2026 The pid_controller contributors
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+# PID_ATune.Tune() blocks for the whole relay test (mostly sleeping between samples), so
+#  each tune runs in its own thread.  The orchestrator only starts a tune when both the
+#  overall limit and the limit for the loop's plant area allow it.
+
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from pid_controller import PID_ATune
+
+def _signature_key(signature):
+    """ Canonical form of a plant signature, as stored and compared by TuneCache. """
+    return json.dumps(signature, sort_keys=True)
+
+def _check_limit(name, limit):
+    if not isinstance(limit, int) or limit < 1:
+        raise ValueError("%s must be an int of at least 1, got %r" % (name, limit))
+
+class TuneCache(object):
+    """ Tuning results keyed by loop ID.
+
+        Each entry remembers the plant signature it was tuned against (any JSON-able value
+        describing the loop's hardware/process, chosen by the caller); a lookup with a
+        different signature is a miss.  Signatures are compared in their JSON form, so e.g.
+        a tuple still matches after a save()/load() round trip.  Loop IDs must be strings or
+        numbers, so that they survive that round trip too.
+
+        Entries expire after `ttl` seconds (None: never), and the least recently used entries
+        are dropped beyond `max_entries`.  If `path` is given, the cache is loaded from it on
+        construction and can be written back with save().
+    """
+
+    def __init__(self, max_entries=1000, ttl=None, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()     # loop_id -> (signature key, timestamp, result), LRU first
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, loop_id):
+        return loop_id in self._entries
+
+    def get(self, loop_id, signature=None, now=None):
+        """ Return the cached result for loop_id, or None if missing, stale or tuned against another signature. """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            entry = self._entries.get(loop_id)
+            if entry is None:
+                return None
+            cached_sig, stamp, result = entry
+            if self.ttl is not None and now - stamp > self.ttl:
+                del self._entries[loop_id]
+                return None
+            if cached_sig != _signature_key(signature):
+                return None
+            self._entries.move_to_end(loop_id)
+            return result
+
+    def put(self, loop_id, signature, result, now=None):
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self._entries.pop(loop_id, None)
+            self._entries[loop_id] = (_signature_key(signature), now, result)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, loop_id):
+        with self._lock:
+            self._entries.pop(loop_id, None)
+
+    def save(self, path=None):
+        """ Write the cache to path (default: the path given at construction) as JSON. """
+        path = path or self.path
+        if path is None:
+            raise ValueError("no path to save TuneCache to")
+        with self._save_lock:
+            with self._lock:
+                data = [[loop_id, sig, stamp, result] for loop_id, (sig, stamp, result) in self._entries.items()]
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)     # don't leave a half-written cache behind
+
+    def load(self, path=None):
+        """ Replace the cache contents with those saved at path. """
+        path = path or self.path
+        with open(path) as f:
+            data = json.load(f)
+        with self._lock:
+            self._entries.clear()
+            for loop_id, sig, stamp, result in data:
+                self._entries[loop_id] = (sig, stamp, result)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class TuneOrchestrator(object):
+    """ Autotune many loops in parallel.
+
+        Loops are added with add(), then run() tunes them all and returns their results.
+        At most `max_workers` tunes run at once overall (None: no overall limit), and at most
+        area_limits[area] (or `default_area_limit`) within each plant area.  Loops whose cached
+        result in `cache` matches their plant signature are not retuned.  Every limit must be
+        at least 1 (ValueError otherwise), since a tune that can never start would block run().
+        If the cache has a path, it is saved after each completed tune, so a crash partway
+        through a long run loses at most the tunes still in progress.
+
+        Results are dicts of Kp, Ki and Kd.  `tuner_factory` is called as
+        tuner_factory(measure_func, output_func) and must return something that behaves like
+        PID_ATune.
+    """
+
+    def __init__(self, max_workers=None, default_area_limit=1, area_limits=None, cache=None,
+                 tuner_factory=PID_ATune.PID_ATune):
+        self.max_workers = max_workers
+        self.default_area_limit = default_area_limit
+        self.area_limits = dict(area_limits or {})
+        self._check_limits()
+        self.cache = cache
+        self.tuner_factory = tuner_factory
+
+        self.results = {}
+        self.failures = {}
+        self.save_errors = []           # (loop_id, exception) for failed cache saves; None: final save
+
+        self._jobs = OrderedDict()
+        self._cond = threading.Condition()
+        self._running = {}              # area -> number of tunes in progress
+        self._num_running = 0
+        self._num_cached = 0
+        self._started = None
+        self._finished = None
+
+    def add(self, loop_id, measure_func, output_func, area=None, signature=None, **settings):
+        """ Queue a loop for tuning.  settings (e.g. output_step, noise_band) are set on its tuner;
+            a name the tuner doesn't have makes that loop fail, rather than being ignored.
+        """
+        if loop_id in self._jobs:
+            raise ValueError("loop %r already added" % (loop_id,))
+        _check_limit("limit for area %r" % (area,), self.area_limit(area))
+        self._jobs[loop_id] = (measure_func, output_func, area, signature, settings)
+
+    def area_limit(self, area):
+        return self.area_limits.get(area, self.default_area_limit)
+
+    def _check_limits(self):
+        """ Raise ValueError for any limit that would stop a tune from ever starting. """
+        if self.max_workers is not None:
+            _check_limit("max_workers", self.max_workers)
+        _check_limit("default_area_limit", self.default_area_limit)
+        for area, limit in self.area_limits.items():
+            _check_limit("limit for area %r" % (area,), limit)
+
+    @property
+    def progress(self):
+        """ Snapshot of how far run() has got, as a dict. """
+        with self._cond:
+            done = len(self.results) + len(self.failures)
+            now = self._finished or time.time()
+            elapsed = now - self._started if self._started is not None else 0.0
+            tuned = len(self.results) - self._num_cached     # successful tunes, not failures
+            return {
+                'total': len(self._jobs),
+                'done': done,
+                'running': self._num_running,
+                'pending': len(self._jobs) - done - self._num_running,
+                'failed': len(self.failures),
+                'cached': self._num_cached,
+                'elapsed': elapsed,
+                'throughput': tuned / elapsed if elapsed > 0 else 0.0,     # tunes per second
+            }
+
+    def run(self):
+        """ Tune every added loop, blocking until all are done.  Returns the results dict.
+
+            Loops whose tune raised (e.g. PIDNotStableError), or that were given a setting
+            their tuner doesn't have, are in `failures` instead.  Errors saving the cache to
+            disk don't affect the results; they are collected in `save_errors`.
+        """
+        # the limits are public attributes, so check them again in case they were changed
+        self._check_limits()
+        for job in self._jobs.values():
+            _check_limit("limit for area %r" % (job[2],), self.area_limit(job[2]))
+
+        self.results = {}
+        self.failures = {}
+        self.save_errors = []
+        self._num_cached = 0
+        self._started = time.time()
+        self._finished = None
+
+        pending = []
+        for loop_id, job in self._jobs.items():
+            signature = job[3]
+            cached = self.cache.get(loop_id, signature) if self.cache is not None else None
+            if cached is not None:
+                self.results[loop_id] = cached
+                self._num_cached += 1
+            else:
+                pending.append(loop_id)
+
+        with self._cond:
+            while pending or self._num_running:
+                for loop_id in list(pending):
+                    if self.max_workers is not None and self._num_running >= self.max_workers:
+                        break
+                    area = self._jobs[loop_id][2]
+                    if self._running.get(area, 0) >= self.area_limit(area):
+                        continue
+                    pending.remove(loop_id)
+                    self._running[area] = self._running.get(area, 0) + 1
+                    self._num_running += 1
+                    worker = threading.Thread(target=self._tune, args=(loop_id,))
+                    worker.daemon = True
+                    worker.start()
+                self._cond.wait()
+            self._finished = time.time()
+
+        if self.cache is not None:
+            self._save_cache(None)
+        return self.results
+
+    def _tune(self, loop_id):
+        measure_func, output_func, area, signature, settings = self._jobs[loop_id]
+        try:
+            tuner = self.tuner_factory(measure_func, output_func)
+            # a mistyped setting would otherwise just be ignored, leaving the default in place
+            unknown = sorted(name for name in settings if not hasattr(tuner, name))
+            if unknown:
+                raise ValueError("unknown tuner setting(s) for loop %r: %s" % (loop_id, ", ".join(unknown)))
+            for name, value in settings.items():
+                setattr(tuner, name, value)
+            tuner.Tune()
+            result = {'Kp': tuner.Kp, 'Ki': tuner.Ki, 'Kd': tuner.Kd}
+        except Exception as e:
+            with self._cond:
+                self.failures[loop_id] = e
+        else:
+            # record the result before persisting it, so a failed save can't lose a good tune
+            with self._cond:
+                self.results[loop_id] = result
+            if self.cache is not None:
+                self.cache.put(loop_id, signature, result)
+                self._save_cache(loop_id)
+        finally:
+            # always release the slot, or run() would wait forever
+            with self._cond:
+                self._running[area] -= 1
+                self._num_running -= 1
+                self._cond.notify()
+
+    def _save_cache(self, loop_id):
+        """ Write the cache to disk (if it has a path), noting any error in save_errors. """
+        if self.cache.path is None:
+            return
+        try:
+            self.cache.save()
+        except Exception as e:
+            with self._cond:
+                self.save_errors.append((loop_id, e))
@@ -0,0 +1,17 @@
+""" PID controller and autotuner.
+
+    Submodules are imported on first attribute access, so that `import pid_controller`
+    stays cheap; `from pid_controller import PID` etc. work as usual.
+"""
+
+import importlib
+
+__all__ = ['PID', 'PID_ATune', 'PeakCounter', 'CycleStats', 'LoopMetrics', 'TuneOrchestrator']
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+from pid_controller import CycleStats
+import unittest
+import math
+
+class CycleStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.CS = CycleStats.CycleStats(0, 0.5)
+
+    def feed_sine(self, amplitude=2.0, period=4.0, cycles=5, step=0.25, t0=0.0):
+        """ Feed a sine wave starting just below the setpoint; returns the time after the last sample. """
+        n = int(cycles * period / step)
+        for i in range(n):
+            t = t0 + i * step
+            self.CS.add_value(amplitude * math.sin(2 * math.pi * t / period), t)
+        return t0 + n * step
+
+    def test_construct(self):
+        self.assertIsInstance(self.CS, CycleStats.CycleStats)
+        self.assertEqual(self.CS.cycles, 0)
+        self.assertFalse(self.CS.full)
+
+    def test_window_too_small(self):
+        with self.assertRaises(ValueError):
+            CycleStats.CycleStats(0, 0.5, 1)
+
+    def test_chatter_in_band(self):
+        for i, val in enumerate([0.4, -0.4, 0.6, 0.3, 0.7, 0.2, 0.6]):
+            self.CS.add_value(val, i)
+        # never dropped below the band, so only one cycle has started
+        self.assertEqual(self.CS.cycles, 0)
+
+    def test_sine(self):
+        self.feed_sine()
+        # the first up-crossing starts cycle 0, each following one completes a cycle
+        self.assertEqual(self.CS.cycles, 4)
+        self.assertTrue(self.CS.full)
+        self.assertAlmostEqual(self.CS.amplitude, 4.0)
+        self.assertAlmostEqual(self.CS.period, 4.0)
+        self.assertAlmostEqual(self.CS.peak_spread, 0.0)
+        self.assertEqual(self.CS.get_last_peaks(2), [2.0, 2.0])
+        self.assertEqual(len(self.CS.get_last_peaks(10)), 3)
+
+    def test_just_completed(self):
+        self.CS.add_value(1, 0)
+        self.CS.add_value(-1, 1)
+        self.assertFalse(self.CS.just_completed)
+        self.CS.add_value(1, 2)
+        self.assertTrue(self.CS.just_completed)
+        self.CS.add_value(1.5, 3)
+        self.assertFalse(self.CS.just_completed)
+
+    def test_outlier_leaves_window(self):
+        self.CS.add_value(50, 0)
+        self.feed_sine(t0=1.0, cycles=6)
+        self.assertEqual(self.CS.abs_max, 50)
+        self.assertAlmostEqual(self.CS.window_max, 2.0)
+        self.assertAlmostEqual(self.CS.window_min, -2.0)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(CycleStatsTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
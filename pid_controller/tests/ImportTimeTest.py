@@ -0,0 +1,40 @@
+#!/usr/bin/python
+
+import os
+import subprocess
+import sys
+import unittest
+
+# `import pid_controller` (and the core modules) may add at most this much to interpreter startup
+IMPORT_BUDGET_SEC = 0.05
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _run(code):
+    env = dict(os.environ, PYTHONPATH=_ROOT)
+    return subprocess.check_output([sys.executable, "-c", code], env=env).decode()
+
+def _startup_time(stmt, repeat=5):
+    """ Best-of-N wall time of a fresh interpreter running stmt. """
+    code = "import time; t = time.time(); %s; print(time.time() - t)" % stmt
+    return min(float(_run(code)) for _ in range(repeat))
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_package_is_lazy(self):
+        out = _run("import sys, pid_controller; print(sorted(m for m in sys.modules if m.startswith('pid_controller')))")
+        self.assertEqual(out.strip(), "['pid_controller']")
+
+    def test_no_heavy_imports(self):
+        out = _run("import sys; from pid_controller import PID, PID_ATune, LoopMetrics; "
+                   "print([m for m in ('numba', 'numpy', 'matplotlib') if m in sys.modules])")
+        self.assertEqual(out.strip(), "[]")
+
+    def test_import_budget(self):
+        self.assertLess(_startup_time("import pid_controller"), IMPORT_BUDGET_SEC)
+        self.assertLess(_startup_time("from pid_controller import PID, PID_ATune, LoopMetrics"),
+                        IMPORT_BUDGET_SEC)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(ImportTimeTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
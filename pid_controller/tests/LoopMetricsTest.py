@@ -0,0 +1,130 @@
+#!/usr/bin/python
+
+from pid_controller import LoopMetrics
+from pid_controller import PID
+import unittest
+import math
+import random
+
+class LoopMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.LM = LoopMetrics.LoopMetrics()
+
+    def test_construct(self):
+        self.assertIsInstance(self.LM, LoopMetrics.LoopMetrics)
+        self.assertEqual(self.LM.iae, 0)
+        self.assertEqual(self.LM.oscillation_index, 0)
+        self.assertEqual(self.LM.saturation_fraction, 0)
+
+    def test_negative_noise_band(self):
+        with self.assertRaises(ValueError):
+            self.LM.noise_band = -1
+
+    def test_error_integrals(self):
+        for err in (1, -2, 3):
+            self.LM.update(err, 0, 0.5)
+        self.assertAlmostEqual(self.LM.iae, 3.0)
+        self.assertAlmostEqual(self.LM.ise, 7.0)
+        # t = 0.5, 1.0, 1.5
+        self.assertAlmostEqual(self.LM.itae, 0.25 + 1.0 + 2.25)
+
+    def test_saturation(self):
+        self.LM.update(1, 10, 1.0, True)
+        self.LM.update(1, 5, 1.0, False)
+        self.LM.update(1, 10, 2.0, True)
+        self.assertAlmostEqual(self.LM.saturation_fraction, 0.75)
+
+    def test_valve_travel(self):
+        for out in (0, 5, 5, 8, 2, 4):
+            self.LM.update(0, out, 1.0)
+        self.assertEqual(self.LM.valve_travel, 5 + 3 + 6 + 2)
+        self.assertEqual(self.LM.valve_reversals, 2)
+
+    def test_peaks(self):
+        # swings inside +/- 0.5 don't count
+        for err in (0, 1, 2, 0.4, -0.4, 0.3, -1, 0, 1):
+            self.LM.update(err, 0, 1.0)
+        self.assertEqual(self.LM.peaks, 2)
+        self.assertAlmostEqual(self.LM.oscillation_index, 2 / 9.0)
+
+    def test_noise_scores_below_oscillation(self):
+        rng = random.Random(42)
+        noisy = LoopMetrics.LoopMetrics()
+        oscillating = LoopMetrics.LoopMetrics()
+        for i in range(1000):
+            t = i * 0.1
+            noisy.update(rng.gauss(0, 0.01), 0, 0.1)
+            oscillating.update(5 * math.sin(2 * math.pi * t / 20), 0, 0.1)
+        self.assertEqual(noisy.peaks, 0)
+        # 100s of a 20s-period oscillation: 5 cycles, 10 half-cycles (the first swing isn't one)
+        self.assertEqual(oscillating.peaks, 9)
+        self.assertLess(noisy.oscillation_index, oscillating.oscillation_index)
+
+    def test_reset(self):
+        self.LM.update(3, 1, 1.0, True)
+        self.LM.reset()
+        self.assertEqual(self.LM.snapshot()['samples'], 0)
+        self.assertEqual(self.LM.iae, 0)
+
+    def test_attach(self):
+        p = PID.PID()
+        p.Kp = 1
+        p.setpoint = 10
+        p.out_max = 4
+        self.LM.attach(p)
+        p.gen_out(0)
+        p.gen_out(2)
+        self.assertEqual(self.LM.samples, 2)
+        # first step clamps to out_max (and unwinds Ci), second doesn't
+        self.assertTrue(0 < self.LM.saturated_time < self.LM.elapsed)
+        self.assertAlmostEqual(self.LM.valve_travel, 2)
+
+    def test_attach_twice(self):
+        p = PID.PID()
+        self.LM.attach(p)
+        self.LM.attach(p)
+        with self.assertRaises(ValueError):
+            LoopMetrics.LoopMetrics().attach(p)
+        self.LM.detach(p)
+        self.assertIsNone(p.metrics)
+
+class MetricsRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.MR = LoopMetrics.MetricsRegistry()
+
+    def test_register(self):
+        p = PID.PID()
+        lm = self.MR.register("FIC-101", p)
+        self.assertIs(p.metrics, lm)
+        self.assertIs(self.MR.register("FIC-101"), lm)
+        self.assertEqual(len(self.MR), 1)
+        self.MR.unregister("FIC-101")
+        self.assertFalse("FIC-101" in self.MR)
+        self.assertIsNone(p.metrics)
+
+    def test_register_attached_pid(self):
+        p = PID.PID()
+        self.MR.register("FIC-101", p)
+        with self.assertRaises(ValueError):
+            self.MR.register("FIC-102", p)
+        with self.assertRaises(ValueError):
+            self.MR.register("FIC-101", PID.PID())
+        self.assertFalse("FIC-102" in self.MR)
+
+    def test_noise_band(self):
+        self.assertEqual(self.MR.register("FIC-101").noise_band, 0.5)
+        self.assertEqual(self.MR.register("FIC-102", noise_band=2).noise_band, 2)
+
+    def test_snapshot_and_worst(self):
+        for i in range(5):
+            self.MR.register(i).update(i, 0, 1.0)
+        snap = self.MR.snapshot()
+        self.assertEqual(sorted(snap.keys()), list(range(5)))
+        self.assertEqual([loop_id for loop_id, _ in self.MR.worst(2)], [4, 3])
+
+if __name__ == '__main__':
+    for tcase in LoopMetricsTest, MetricsRegistryTest:
+        suite = unittest.TestLoader().loadTestsFromTestCase(tcase)
+        unittest.TextTestRunner(verbosity=2).run(suite)
@@ -1,6 +1,7 @@
 #!/usr/bin/python
 
-import PID_ATune
+from pid_controller import CycleStats
+from pid_controller import PID_ATune
 import unittest
 import random
 
@@ -13,11 +14,11 @@ class PID_ATuneTest(unittest.TestCase):
         self.assertIsInstance(self.PAT, PID_ATune.PID_ATune)
     
     def test_init(self):
-        self.assertEquals(self.PAT.control_type, True)
+        self.assertEqual(self.PAT.control_type, True)
     
     def test_outputstep(self):
         self.PAT.output_step = 3.2
-        self.assertEquals(self.PAT.output_step,3.2)
+        self.assertEqual(self.PAT.output_step,3.2)
 
     def test_controltype(self):
         self.PAT.control_type = PID_ATune.ControlType.PID
@@ -29,23 +30,64 @@ class PID_ATuneTest(unittest.TestCase):
         
     def test_lookbacksec0(self):
         self.PAT.lookback_sec = 0
-        self.assertEquals(self.PAT.lookback_sec,1)
+        self.assertEqual(self.PAT.lookback_sec,1)
         
     def test_lookbacksec10(self):
         self.PAT.lookback_sec = 10
-        self.assertEquals(self.PAT.lookback_sec,10)
+        self.assertEqual(self.PAT.lookback_sec,10)
            
     def test_lookbacksec43(self):
         self.PAT.lookback_sec = 43
-        self.assertEquals(self.PAT.lookback_sec,43)
+        self.assertEqual(self.PAT.lookback_sec,43)
 
     def test_lookbacksec100(self):
         self.PAT.lookback_sec = 100
-        self.assertEquals(self.PAT.lookback_sec,100)
+        self.assertEqual(self.PAT.lookback_sec,100)
         
     def test_noiseband(self):
         self.PAT.noise_band = 4.6
-        self.assertEquals(self.PAT.noise_band, 4.6)
+        self.assertEqual(self.PAT.noise_band, 4.6)
+
+    def test_ku_extent_param(self):
+        self.assertEqual(self.PAT.ku_extent, PID_ATune.KuExtent.AMPLITUDE)
+        with self.assertRaises(ValueError):
+            self.PAT.ku_extent = "window"
+
+    def test_ku_extent_outlier(self):
+        self.PAT = PID_ATune.PID_ATune(None, lambda out: out)
+        self.PAT._output_start = 0
+        self.PAT.output_step = 10
+        self.PAT.stats = CycleStats.CycleStats(0, 0.5)
+        self.PAT.stats.add_value(20, 0)           # early outlier
+        for cycle in range(5):
+            for i, val in enumerate((-2, 2)):
+                self.PAT.stats.add_value(val, 1 + cycle * 4 + i * 2)
+        # by default Ku comes from the mean amplitude of the last 3 cycles, which excludes the outlier
+        self.PAT._finish_up()
+        self.assertAlmostEqual(self.PAT._Ku, 80 / (4 * 3.14159))
+        self.assertAlmostEqual(self.PAT._Pu, 4)
+        # ...and so does the windowed max/min, once the outlier has left the window
+        self.PAT.ku_extent = PID_ATune.KuExtent.WINDOW
+        self.PAT._finish_up()
+        self.assertAlmostEqual(self.PAT._Ku, 80 / (4 * 3.14159))
+        self.PAT.ku_extent = PID_ATune.KuExtent.RUN
+        self.PAT._finish_up()
+        self.assertAlmostEqual(self.PAT._Ku, 80 / (22 * 3.14159))
+
+    def test_ku_from_amplitude(self):
+        self.PAT = PID_ATune.PID_ATune(None, lambda out: out)
+        self.PAT._output_start = 0
+        self.PAT.output_step = 10
+        self.PAT.stats = CycleStats.CycleStats(0, 0.5)
+        # cycles drift up and down: each is 4 peak-to-peak, but the window spans 3 - (-3)
+        for t, val in enumerate((1, 3, -1, 1, 1, -3, 1)):
+            self.PAT.stats.add_value(val, t)
+        self.assertEqual(self.PAT.stats.window_max - self.PAT.stats.window_min, 6)
+        self.PAT._finish_up()
+        self.assertAlmostEqual(self.PAT._Ku, 80 / (4 * 3.14159))
+        self.PAT.ku_extent = PID_ATune.KuExtent.WINDOW
+        self.PAT._finish_up()
+        self.assertAlmostEqual(self.PAT._Ku, 80 / (6 * 3.14159))
 
 class PID_ATune_StabilityTest(unittest.TestCase):
     """ Test the stability verification method with dummy input/output functions. """
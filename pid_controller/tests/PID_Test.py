@@ -1,6 +1,6 @@
 #!/usr/bin/python
 
-import PID
+from pid_controller import PID
 import unittest
 import random
 
@@ -13,8 +13,8 @@ class PID_Test(unittest.TestCase):
         self.assertIsInstance(self.p, PID.PID)
     
     def test_init(self):
-        self.assertEquals(self.p.setpoint, 0)
-        self.assertEquals(self.p._prev_PV, 0)
+        self.assertEqual(self.p.setpoint, 0)
+        self.assertEqual(self.p._prev_PV, 0)
             
     # assigning to C{p,i,d} should fail
     def test_assign_to_internal_PID_state(self):
@@ -28,11 +28,11 @@ class PID_Test(unittest.TestCase):
         self.p.out_min = 5
         self.p.out_max = 10
         # normal case
-        self.assertEquals(self.p.manual_override(6),6)
+        self.assertEqual(self.p.manual_override(6),6)
         # clamp to max
-        self.assertEquals(self.p.manual_override(15),10)
+        self.assertEqual(self.p.manual_override(15),10)
         # clamp to min
-        self.assertEquals(self.p.manual_override(2),5)
+        self.assertEqual(self.p.manual_override(2),5)
             
     # manual_mode assignments work
     def test_manual_mode(self):    
@@ -56,7 +56,7 @@ class PID_Test(unittest.TestCase):
     # make sure manual_override returns a value immediately after it's set
     def test_manual_return(self):
         outval = self.p.manual_override(random.randint(1,10))
-        self.assertEquals(self.p.manual_override(None), outval)
+        self.assertEqual(self.p.manual_override(None), outval)
     
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(PID_Test)
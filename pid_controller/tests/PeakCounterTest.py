@@ -1,6 +1,6 @@
 #!/usr/bin/python
 
-import PeakCounter
+from pid_controller import PeakCounter
 import unittest
 import random
 import time
@@ -14,11 +14,11 @@ class PeakCounterTest(unittest.TestCase):
         self.assertIsInstance(self.PC, PeakCounter.PeakCounter)
 
     def test_initnumpeaks(self):
-        self.assertEquals(self.PC.num_peaks,0)
+        self.assertEqual(self.PC.num_peaks,0)
 
     def test_fivepeaks(self):
         self.PC = PeakCounter.PeakCounter(5)
-        self.assertEquals(self.PC._max_peaks,5)
+        self.assertEqual(self.PC._max_peaks,5)
     
     def test_add_value(self):
         """docstring for test_add_value"""
@@ -35,7 +35,7 @@ class PeakCounterTest(unittest.TestCase):
     def test_set_lookback_size(self):
         i = random.randint(2,85)
         self.PC.lookback_size = i
-        self.assertEquals(self.PC.lookback_size,i)
+        self.assertEqual(self.PC.lookback_size,i)
 
     def test_justInflexted(self):
         # FIXME: implement
@@ -51,11 +51,11 @@ class PeakCounterTest(unittest.TestCase):
         for i in seq:
             self.PC.add_value(i)
             time.sleep(0.1)
-        self.assertEquals(self.PC.num_peaks,3)
-        self.assertEquals(self.PC.get_last_peaks(2),[12, 8.7])
-        self.assertEquals(self.PC.get_last_peaks(4),[5, 12, 8.7])
-        self.assertEquals(self.PC.get_last_peaks(3),[5, 12, 8.7])
-        self.assertEquals(self.PC.get_last_peaks(1),[8.7])
+        self.assertEqual(self.PC.num_peaks,3)
+        self.assertEqual(self.PC.get_last_peaks(2),[12, 8.7])
+        self.assertEqual(self.PC.get_last_peaks(4),[5, 12, 8.7])
+        self.assertEqual(self.PC.get_last_peaks(3),[5, 12, 8.7])
+        self.assertEqual(self.PC.get_last_peaks(1),[8.7])
         ## last_peak_delta includes processing time, so we can't predict it precisely
         self.assertTrue((self.PC.last_peak_delta - 0.7) < 0.005)
     pass
@@ -0,0 +1,189 @@
+#!/usr/bin/python
+
+from pid_controller import PID_ATune
+from pid_controller import TuneOrchestrator
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+class FakeTuner(object):
+    """ Stands in for PID_ATune: Tune() just sleeps, and records how many tunes overlap. """
+
+    lock = threading.Lock()
+    running = {}
+    max_running = {}
+    calls = 0
+
+    def __init__(self, measure_func, output_func):
+        self.area = measure_func()
+        self.output_step = None
+
+    def Tune(self):
+        cls = FakeTuner
+        with cls.lock:
+            cls.calls += 1
+            cls.running[self.area] = cls.running.get(self.area, 0) + 1
+            cls.max_running[self.area] = max(cls.max_running.get(self.area, 0), cls.running[self.area])
+        time.sleep(0.02)
+        with cls.lock:
+            cls.running[self.area] -= 1
+        if self.area == "unstable":
+            raise PID_ATune.PIDNotStableError("unstable")
+        self.Kp, self.Ki, self.Kd = self.output_step, 2, 3
+
+    @classmethod
+    def reset(cls):
+        cls.running, cls.max_running, cls.calls = {}, {}, 0
+
+class TuneCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.TC = TuneOrchestrator.TuneCache(max_entries=2, ttl=10)
+
+    def test_signature(self):
+        self.TC.put("TIC-1", "sig-a", {'Kp': 1}, now=0)
+        self.assertEqual(self.TC.get("TIC-1", "sig-a", now=1), {'Kp': 1})
+        self.assertIsNone(self.TC.get("TIC-1", "sig-b", now=1))
+        self.assertIsNone(self.TC.get("TIC-2", "sig-a", now=1))
+
+    def test_ttl(self):
+        self.TC.put("TIC-1", None, {'Kp': 1}, now=0)
+        self.assertIsNone(self.TC.get("TIC-1", now=11))
+        self.assertFalse("TIC-1" in self.TC)
+
+    def test_lru(self):
+        self.TC.put("a", None, 1, now=0)
+        self.TC.put("b", None, 2, now=0)
+        self.TC.get("a", now=0)
+        self.TC.put("c", None, 3, now=0)
+        self.assertEqual(len(self.TC), 2)
+        self.assertFalse("b" in self.TC)
+
+    def test_persistence(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "tunes.json")
+            self.TC.path = path
+            self.TC.put("TIC-1", "sig-a", {'Kp': 1.5})
+            self.TC.put("TIC-2", ("valve-v2", 3), {'Kp': 2.5})
+            self.TC.save()
+            loaded = TuneOrchestrator.TuneCache(path=path)
+            self.assertEqual(loaded.get("TIC-1", "sig-a"), {'Kp': 1.5})
+            self.assertEqual(loaded.get("TIC-2", ("valve-v2", 3)), {'Kp': 2.5})
+            self.assertIsNone(loaded.get("TIC-2", ("valve-v2", 4)))
+        finally:
+            shutil.rmtree(tmpdir)
+
+class TuneOrchestratorTest(unittest.TestCase):
+
+    def setUp(self):
+        FakeTuner.reset()
+        self.TO = TuneOrchestrator.TuneOrchestrator(max_workers=4, default_area_limit=2,
+                                                    area_limits={"boiler": 1},
+                                                    tuner_factory=FakeTuner)
+
+    def add_loops(self, area, n):
+        for i in range(n):
+            self.TO.add("%s-%d" % (area, i), lambda: area, None, area=area, output_step=i)
+
+    def test_area_limits(self):
+        self.add_loops("boiler", 3)
+        self.add_loops("kiln", 4)
+        results = self.TO.run()
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results["kiln-3"], {'Kp': 3, 'Ki': 2, 'Kd': 3})
+        self.assertEqual(FakeTuner.max_running["boiler"], 1)
+        self.assertEqual(FakeTuner.max_running["kiln"], 2)
+
+    def test_bad_limits(self):
+        for kwargs in ({'default_area_limit': 0}, {'area_limits': {"kiln": 0}},
+                       {'max_workers': 0}, {'area_limits': {"kiln": None}}):
+            with self.assertRaises(ValueError):
+                TuneOrchestrator.TuneOrchestrator(tuner_factory=FakeTuner, **kwargs)
+
+    def test_bad_limit_set_later(self):
+        self.add_loops("kiln", 1)
+        self.TO.area_limits["kiln"] = 0
+        with self.assertRaises(ValueError):
+            self.TO.run()
+        self.TO.area_limits["kiln"] = 1
+        self.TO.default_area_limit = None
+        with self.assertRaises(ValueError):
+            self.add_loops("boiler2", 1)
+        self.TO.default_area_limit = 2
+        self.TO.max_workers = 0
+        with self.assertRaises(ValueError):
+            self.TO.run()
+
+    def test_duplicate(self):
+        self.add_loops("kiln", 1)
+        with self.assertRaises(ValueError):
+            self.add_loops("kiln", 1)
+
+    def test_failure(self):
+        self.add_loops("unstable", 1)
+        self.add_loops("kiln", 1)
+        self.TO.run()
+        self.assertIsInstance(self.TO.failures["unstable-0"], PID_ATune.PIDNotStableError)
+        self.assertEqual(list(self.TO.results), ["kiln-0"])
+        progress = self.TO.progress
+        self.assertEqual(progress['failed'], 1)
+        self.assertAlmostEqual(progress['throughput'] * progress['elapsed'], 1)
+
+    def test_cache_skips_retune(self):
+        self.TO.cache = TuneOrchestrator.TuneCache()
+        self.add_loops("kiln", 3)
+        self.TO.run()
+        self.assertEqual(FakeTuner.calls, 3)
+        self.TO.cache.put("kiln-1", "rebuilt", {'Kp': 0})     # plant changed since last tune
+        self.TO.run()
+        self.assertEqual(FakeTuner.calls, 4)
+        progress = self.TO.progress
+        self.assertEqual(progress['cached'], 2)
+        self.assertEqual(progress['done'], 3)
+        self.assertEqual(progress['pending'], 0)
+        self.assertEqual(progress['running'], 0)
+        self.assertTrue(progress['throughput'] > 0)
+
+    def test_unknown_setting(self):
+        self.TO.add("b", lambda: "kiln", None, area="kiln", outptu_step=5)
+        self.TO.run()
+        self.assertEqual(self.TO.results, {})
+        self.assertIsInstance(self.TO.failures["b"], ValueError)
+        self.assertEqual(FakeTuner.calls, 0)
+
+    def test_save_error(self):
+        path = os.path.join(tempfile.gettempdir(), "no-such-dir-for-pid-tests", "tunes.json")
+        self.TO.cache = TuneOrchestrator.TuneCache(path=path)
+        self.add_loops("kiln", 1)
+        results = self.TO.run()      # must not raise
+        self.assertEqual(results, {"kiln-0": {'Kp': 0, 'Ki': 2, 'Kd': 3}})
+        self.assertEqual(self.TO.failures, {})
+        self.assertEqual([loop_id for loop_id, _ in self.TO.save_errors], ["kiln-0", None])
+        self.assertIsInstance(self.TO.save_errors[0][1], OSError)
+
+    def test_cache_saved_per_tune(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "tunes.json")
+            seen = []
+            def factory(measure_func, output_func):
+                # what a restarted process would find on disk when this tune starts
+                if os.path.exists(path):
+                    seen.append(len(TuneOrchestrator.TuneCache(path=path)))
+                return FakeTuner(measure_func, output_func)
+            self.TO = TuneOrchestrator.TuneOrchestrator(max_workers=1, tuner_factory=factory,
+                                                        cache=TuneOrchestrator.TuneCache(path=path))
+            self.add_loops("kiln", 3)
+            self.TO.run()
+            self.assertEqual(seen, [1, 2])
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    for tcase in TuneCacheTest, TuneOrchestratorTest:
+        suite = unittest.TestLoader().loadTestsFromTestCase(tcase)
+        unittest.TextTestRunner(verbosity=2).run(suite)